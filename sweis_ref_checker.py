@@ -12,9 +12,15 @@ Usage:
 
 import re
 import os
+import pickle
 import sys
+import zlib
 from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from itertools import groupby
+from operator import attrgetter
 
 try:
     import fitz  # PyMuPDF
@@ -22,12 +28,21 @@ except ImportError:
     print("ERROR: PyMuPDF is required. Install with: pip install PyMuPDF")
     sys.exit(1)
 
+try:
+    import re2  # google-re2, optional: speeds up the reference scan
+except ImportError:
+    re2 = None
+
 
 # ---------------------------------------------------------------------------
 # Data model
 # ---------------------------------------------------------------------------
 
-@dataclass
+# Tens of thousands of these are built per run, so they use __slots__, and
+# the identifier/volume strings stored on them are interned (the same few
+# hundred IDs recur throughout the text).
+
+@dataclass(slots=True)
 class Reference:
     """An internal reference found in the document text."""
     ref_type: str        # "section", "chapter", "table", "figure", "appendix"
@@ -38,7 +53,7 @@ class Reference:
     context: str = ""    # surrounding text snippet
 
 
-@dataclass
+@dataclass(slots=True)
 class Target:
     """A reference target (heading, label, caption) found in the document."""
     target_type: str     # "section", "chapter", "table", "figure", "appendix"
@@ -52,27 +67,134 @@ class Target:
 # PDF text extraction
 # ---------------------------------------------------------------------------
 
-def extract_pages(pdf_path: str) -> list[tuple[int, str]]:
-    """Extract text from each page of a PDF. Returns list of (page_num, text)."""
-    pages = []
-    doc = fitz.open(pdf_path)
-    for i, page in enumerate(doc):
-        text = page.get_text("text")
-        pages.append((i + 1, text))
-    doc.close()
+# Plain-text extraction flags: PyMuPDF's own default for get_text("text"),
+# passed explicitly and used in the page cache key. Ligatures must stay
+# preserved -- expanding "ﬁ" to "fi" changes what the context filters see
+# (e.g. "of the ﬁnal report" vs OF_THE_RE).
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT
+
+
+def count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF."""
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def extract_pages(
+    pdf_path: str,
+    start: int = 0,
+    stop: int | None = None,
+) -> Iterator[tuple[int, str]]:
+    """
+    Extract text from each page of a PDF. Yields (page_num, text).
+    start/stop select a 0-based page range; iter_pages uses it to extract
+    one cache block at a time.
+    """
+    # PyMuPDF is not thread-safe, so pages are extracted sequentially; each
+    # page is loaded by index and released as soon as its text is read.
+    with fitz.open(pdf_path) as doc:
+        if stop is None or stop > doc.page_count:
+            stop = doc.page_count
+        for i in range(start, stop):
+            page = doc.load_page(i)
+            text = page.get_text("text", flags=TEXT_FLAGS)
+            del page
+            yield i + 1, text
+
+
+# Extracted text is cached next to each PDF so re-runs (e.g. while tuning
+# the patterns) skip PyMuPDF entirely. The cache is split into blocks of
+# CACHE_BLOCK_PAGES pages, one file per block, so a worker only ever holds
+# one block of text and writes the blocks of its own page range. Each file
+# holds a small pickled key followed by the zlib-compressed pickled pages.
+CACHE_BLOCK_PAGES = 32
+
+
+def page_cache_path(pdf_path: str, start: int) -> str:
+    """Cache file for the block of pages starting at 0-based index start."""
+    return f"{pdf_path}.pages-{start:05d}.cache"
+
+
+def page_cache_key(pdf_path: str, start: int, stop: int) -> tuple[int, ...]:
+    """Cache key for a block: the PDF's size and mtime, the extraction flags
+    and the block's page range."""
+    st = os.stat(pdf_path)
+    return (st.st_size, st.st_mtime_ns, TEXT_FLAGS, start, stop)
+
+
+def load_page_cache(pdf_path: str, start: int, stop: int) -> list[tuple[int, str]] | None:
+    """
+    Return the cached (page_num, text) list for pages start:stop of a PDF, or
+    None if the cache is missing, stale or unreadable. Best effort: a damaged
+    cache file can make unpickling raise almost anything, so every failure
+    just means a re-extract.
+    """
+    try:
+        with open(page_cache_path(pdf_path, start), "rb") as f:
+            if pickle.load(f) != page_cache_key(pdf_path, start, stop):
+                return None
+            pages = pickle.loads(zlib.decompress(f.read()))
+    except Exception:
+        return None
+    if not isinstance(pages, list) or len(pages) != stop - start or not all(
+        isinstance(pg, tuple) and len(pg) == 2
+        and pg[0] == i and isinstance(pg[1], str)
+        for i, pg in enumerate(pages, start + 1)
+    ):
+        return None
     return pages
 
 
+def save_page_cache(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    pages: list[tuple[int, str]],
+) -> None:
+    """Write the cache for pages start:stop of a PDF. Best effort: failures are ignored."""
+    cache_path = page_cache_path(pdf_path, start)
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(page_cache_key(pdf_path, start, stop), f)
+            f.write(zlib.compress(pickle.dumps(pages, pickle.HIGHEST_PROTOCOL), 1))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def iter_pages(pdf_path: str, start: int, stop: int) -> Iterator[tuple[int, str]]:
+    """
+    Yield (page_num, text) for pages start:stop of a PDF, block by block:
+    from the page cache where it is up to date, otherwise from PyMuPDF,
+    writing the block's cache once it has been extracted. start should be
+    a multiple of CACHE_BLOCK_PAGES so the blocks line up between runs.
+    """
+    for block_start in range(start, stop, CACHE_BLOCK_PAGES):
+        block_stop = min(block_start + CACHE_BLOCK_PAGES, stop)
+        cached = load_page_cache(pdf_path, block_start, block_stop)
+        if cached is not None:
+            yield from cached
+            continue
+
+        block = []
+        for page in extract_pages(pdf_path, block_start, block_stop):
+            block.append(page)
+            yield page
+        save_page_cache(pdf_path, block_start, block_stop, block)
+
+
 # ---------------------------------------------------------------------------
 # Normalization helpers
 # ---------------------------------------------------------------------------
 
+DASH_TABLE = str.maketrans({"\u2013": "-", "\u2014": "-"})  # en/em dash -> hyphen
+
+
 def normalize_id(raw: str) -> str:
     """Normalize an identifier for matching: strip whitespace, unify dashes."""
-    s = raw.strip()
-    s = s.replace("\u2013", "-").replace("\u2014", "-")  # en/em dash -> hyphen
-    s = re.sub(r"\s+", " ", s)
-    return s
+    s = raw.strip().translate(DASH_TABLE)
+    return " ".join(s.split())  # collapse internal whitespace runs
 
 
 def normalize_section_id(raw: str) -> str:
@@ -86,52 +208,67 @@ def normalize_section_id(raw: str) -> str:
 # Reference extraction  (what the text *points to*)
 # ---------------------------------------------------------------------------
 
+# Identifier shapes shared by the inline patterns
+SECTION_ID = r'S\.[\d.]+|[\d]+\.[\d.]+'
+LABEL_ID = r'[A-Z]?\.?[\d]+[\d.]*[-–]\d+'
+
 # Patterns for inline references
-# Each tuple: (ref_type, compiled regex, group index for the id)
+# Each tuple: (ref_type, regex source with the id in a "<ref_type>_id" group)
+# Compound references like "Tables A.3.5-1 and A.3.5-2" are captured by an
+# optional trailing "and <id>" clause in a "<ref_type>_id2" group.
 
 REF_PATTERNS = [
     # "Section S.1.3", "Section 5.2", "Section 3.2.4", "Sections S.2.3 and S.2.4"
-    ("section", re.compile(
-        r'Sections?\s+(S\.[\d.]+|[\d]+\.[\d.]+)', re.IGNORECASE
-    ), 1),
+    ("section", rf'Sections?\s+(?P<section_id>{SECTION_ID})'
+                rf'(?:\s+and\s+(?P<section_id2>{SECTION_ID}))?'),
 
     # "Chapter 2", "Chapters 3 and 4"
-    ("chapter", re.compile(
-        r'Chapters?\s+(\d+)', re.IGNORECASE
-    ), 1),
+    ("chapter", r'Chapters?\s+(?P<chapter_id>\d+)'),
 
     # "Table S.2-1", "Table A.3.5-1", "Table 4.3-1", "Tables A.3.5-1 and A.3.5-2"
-    ("table", re.compile(
-        r'Tables?\s+([A-Z]?\.?[\d]+[\d.]*[-–]\d+)', re.IGNORECASE
-    ), 1),
+    ("table", rf'Tables?\s+(?P<table_id>{LABEL_ID})'
+              rf'(?:\s+and\s+(?P<table_id2>{LABEL_ID}))?'),
 
-    # "Figure S.1-1", "Figure 1.3-1"
-    ("figure", re.compile(
-        r'Figures?\s+([A-Z]?\.?[\d]+[\d.]*[-–]\d+)', re.IGNORECASE
-    ), 1),
+    # "Figure S.1-1", "Figure 1.3-1", "Figures 1.3-1 and 1.3-2"
+    ("figure", rf'Figures?\s+(?P<figure_id>{LABEL_ID})'
+               rf'(?:\s+and\s+(?P<figure_id2>{LABEL_ID}))?'),
 
     # "Appendix A", "Appendix H", "Appendices A and B"
-    ("appendix", re.compile(
-        r'Appendi(?:x|ces)\s+([A-Z])\b', re.IGNORECASE
-    ), 1),
+    ("appendix", r'Appendi(?:x|ces)\s+(?P<appendix_id>[A-Z])\b'
+                 r'(?:\s+and\s+(?P<appendix_id2>[A-Z])\b)?'),
 ]
 
-# Additional pattern for compound references like "Tables A.3.5-1 and A.3.5-2"
-COMPOUND_TABLE_RE = re.compile(
-    r'Tables?\s+([A-Z]?\.?[\d]+[\d.]*[-–]\d+)\s+and\s+([A-Z]?\.?[\d]+[\d.]*[-–]\d+)',
-    re.IGNORECASE
-)
-COMPOUND_FIGURE_RE = re.compile(
-    r'Figures?\s+([A-Z]?\.?[\d]+[\d.]*[-–]\d+)\s+and\s+([A-Z]?\.?[\d]+[\d.]*[-–]\d+)',
-    re.IGNORECASE
-)
-COMPOUND_SECTION_RE = re.compile(
-    r'Sections?\s+(S\.[\d.]+|[\d]+\.[\d.]+)\s+and\s+(S\.[\d.]+|[\d]+\.[\d.]+)',
+# All inline patterns combined into one alternation so each page is scanned
+# once; the outer named group of a match (m.lastgroup) gives its ref_type.
+# The keywords are distinct, so no two patterns can match the same span.
+MASTER_REF_RE = re.compile(
+    "|".join(f"(?P<{ref_type}>{body})" for ref_type, body in REF_PATTERNS),
     re.IGNORECASE
 )
-COMPOUND_APPENDIX_RE = re.compile(
-    r'Appendi(?:x|ces)\s+([A-Z])\s+and\s+([A-Z])\b', re.IGNORECASE
-)
+
+# ref_type -> (first id group, second id group or None)
+REF_ID_GROUPS = {
+    ref_type: (
+        f"{ref_type}_id",
+        f"{ref_type}_id2" if f"{ref_type}_id2" in MASTER_REF_RE.groupindex else None,
+    )
+    for ref_type, _ in REF_PATTERNS
+}
+
+# Every MASTER_REF_RE match starts with one of these keywords. With RE2
+# installed, its DFA finds the keyword positions and MASTER_REF_RE is only
+# tried there. RE2's \s, \d and \b are ASCII-only, so it is never used for
+# the patterns themselves -- only for these literals. Python's IGNORECASE
+# also folds "İ" and "ı" to "i", which RE2 does not, hence the explicit class.
+REF_KEYWORDS = ("Section", "Chapter", "Table", "Figure", "Appendi")
+if re2 is not None:
+    _re2_options = re2.Options()
+    _re2_options.case_sensitive = False
+    REF_KEYWORD_RE2 = re2.compile(
+        "|".join(kw.replace("i", "[iİı]") for kw in REF_KEYWORDS), _re2_options
+    )
+else:
+    REF_KEYWORD_RE2 = None
 
 # Patterns that indicate an EXTERNAL reference — skip these
 EXTERNAL_CONTEXT_RE = re.compile(
@@ -162,6 +299,43 @@ REGULATORY_RE = re.compile(
     re.IGNORECASE
 )
 
+# Context checks used by is_external_reference()
+# "of the Final SWEIS" / "of the 2008 SWEIS" right after the match
+OF_THE_RE = re.compile(r'of\s+the\s+(?:Final|2008|previous)', re.IGNORECASE)
+# "Source: Author (Year), Table X-Y" just before the match
+SOURCE_NARROW_RE = re.compile(r'Source:\s*\w+\s*\(\d{4}', re.IGNORECASE)
+# "Source: DOE (2008b), Table 8-14" where the source is further back
+SOURCE_WIDE_RE = re.compile(r'Source:\s*\w+\s*\(\d{4}\w?\)', re.IGNORECASE)
+# "Code of Ordinance, Chapter 18" or "Title 18 USC, Chapter 40"
+LEGAL_CODE_RE = re.compile(
+    r'(?:Code\s+of\s+Ordinance|U\.?S\.?C\.?|United\s+States\s+Code)', re.IGNORECASE
+)
+
+# Cheap substring pre-checks: every match of the regexes above contains at
+# least one of these lower-case literals once the text is case-folded with
+# fold_case(), so a window whose folded text holds none of them cannot match
+# and the regexes are skipped.
+EXTERNAL_FAST_TOKENS = (
+    # EXTERNAL_CONTEXT_RE ("eis" covers SWEIS, CT EIS and DOE/EIS-)
+    "eis", "site-wide", "conveyance", "doe/ea-", "chromium",
+    # OF_THE_RE
+    "final", "2008", "previous",
+    # SOURCE_NARROW_RE / SOURCE_WIDE_RE
+    "source:",
+    # LEGAL_CODE_RE
+    "ordinance", "united", "usc", "u.sc", "us.c", "u.s.c",
+)
+REGULATORY_FAST_TOKENS = ("cfr", "u.s.c.", "fr", "order")
+
+# Characters IGNORECASE matches as a token letter that str.lower() does not
+# turn into it: "İ" and "ı" match "i" (but lower to "i̇" and "ı"), "ſ" matches "s"
+FOLD_TABLE = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def fold_case(text: str) -> str:
+    """Lower-case text the way the IGNORECASE filters see it, for the token checks."""
+    return text.translate(FOLD_TABLE).lower()
+
 
 def get_context(text: str, match_start: int, match_end: int, window: int = 150) -> str:
     """Return a snippet of surrounding text for context."""
@@ -175,35 +349,58 @@ def get_context(text: str, match_start: int, match_end: int, window: int = 150)
     return snippet
 
 
-def is_external_reference(text: str, match_start: int, match_end: int) -> bool:
-    """Check if the surrounding context indicates an external document reference."""
+def is_external_before(text: str, match_start: int) -> bool:
+    """Check the text just before a match for external source / legal code citations."""
+    # "Source: Author (Year), Table X-Y" — citation to a table/figure in another doc
+    before = text[max(0, match_start - 80):match_start]
+    if SOURCE_NARROW_RE.search(before):
+        return True
+    # Also handle "Source: DOE (2008b), Table 8-14" where source is further back
+    before_wide = text[max(0, match_start - 150):match_start]
+    if SOURCE_WIDE_RE.search(before_wide):
+        return True
+
+    # Legal codes: "Code of Ordinance, Chapter 18" or "Title 18 USC, Chapter 40"
+    if LEGAL_CODE_RE.search(before_wide):
+        return True
+
+    return False
+
+
+def is_external_reference(
+    text: str,
+    match_start: int,
+    match_end: int,
+    before_cache: dict[int, bool] | None = None,
+) -> bool:
+    """
+    Check if the surrounding context indicates an external document reference.
+    The checks on the text before the match depend only on match_start; pass
+    a per-page before_cache to reuse them across matches sharing a start
+    (both IDs of a compound reference).
+    """
     window = 200
     start = max(0, match_start - window)
     end = min(len(text), match_end + window)
     context = text[start:end]
 
+    lowered = fold_case(context)
+    if not any(tok in lowered for tok in EXTERNAL_FAST_TOKENS):
+        return False
+
     if EXTERNAL_CONTEXT_RE.search(context):
         return True
 
     # Check for "of the Final SWEIS" or "of the 2008 SWEIS" nearby after the match
     after = text[match_end:min(len(text), match_end + 80)]
-    if re.search(r'of\s+the\s+(?:Final|2008|previous)', after, re.IGNORECASE):
-        return True
-
-    # "Source: Author (Year), Table X-Y" — citation to a table/figure in another doc
-    before = text[max(0, match_start - 80):match_start]
-    if re.search(r'Source:\s*\w+\s*\(\d{4}', before, re.IGNORECASE):
-        return True
-    # Also handle "Source: DOE (2008b), Table 8-14" where source is further back
-    before_wide = text[max(0, match_start - 150):match_start]
-    if re.search(r'Source:\s*\w+\s*\(\d{4}\w?\)', before_wide, re.IGNORECASE):
+    if OF_THE_RE.search(after):
         return True
 
-    # Legal codes: "Code of Ordinance, Chapter 18" or "Title 18 USC, Chapter 40"
-    if re.search(r'(?:Code\s+of\s+Ordinance|U\.?S\.?C\.?|United\s+States\s+Code)', before_wide, re.IGNORECASE):
-        return True
-
-    return False
+    if before_cache is None:
+        return is_external_before(text, match_start)
+    if match_start not in before_cache:
+        before_cache[match_start] = is_external_before(text, match_start)
+    return before_cache[match_start]
 
 
 def is_regulatory_context(text: str, match_start: int, match_end: int) -> bool:
@@ -212,97 +409,119 @@ def is_regulatory_context(text: str, match_start: int, match_end: int) -> bool:
     start = max(0, match_start - window)
     end = min(len(text), match_end + window)
     context = text[start:end]
+    lowered = fold_case(context)
+    if not any(tok in lowered for tok in REGULATORY_FAST_TOKENS):
+        return False
     return bool(REGULATORY_RE.search(context))
 
 
-def extract_references(pages: list[tuple[int, str]], volume: str) -> list[Reference]:
-    """Extract all internal references from the document pages."""
+def iter_ref_matches(text: str) -> Iterator[re.Match]:
+    """
+    Yield the MASTER_REF_RE matches in text, exactly as finditer() would.
+    Uses the RE2 keyword scan when available, else plain finditer().
+    """
+    if REF_KEYWORD_RE2 is None:
+        yield from MASTER_REF_RE.finditer(text)
+        return
+
+    try:
+        candidates = [k.start() for k in REF_KEYWORD_RE2.finditer(text)]
+    except UnicodeEncodeError:
+        # RE2 needs valid UTF-8 (e.g. no lone surrogates from odd fonts)
+        yield from MASTER_REF_RE.finditer(text)
+        return
+
+    last_end = 0
+    for pos in candidates:
+        if pos < last_end:
+            continue
+        m = MASTER_REF_RE.match(text, pos)
+        if m:
+            last_end = m.end()
+            yield m
+
+
+def page_references(page_num: int, text: str, volume: str) -> list[Reference]:
+    """Extract all internal references from the text of a single page."""
     refs = []
+    # Second IDs of compound references follow all first IDs on the page,
+    # as in the separate compound passes this scan replaced: the report takes
+    # an ID's raw_text and occurrence order from its first reference
+    second_refs = []
+    volume = sys.intern(volume)
+    # Per-page memo for is_external_reference(), dropped with the page
+    before_cache: dict[int, bool] = {}
+
+    # Page-level pre-check: a filter's window is part of the page, so if
+    # none of its trigger literals occurs anywhere on the page the filter
+    # cannot fire and is skipped for every match here
+    lowered = fold_case(text)
+    check_external = any(tok in lowered for tok in EXTERNAL_FAST_TOKENS)
+    check_regulatory = any(tok in lowered for tok in REGULATORY_FAST_TOKENS)
+
+    # Skip header/footer lines, TOC pages with dotted leaders
+    # (we still scan them for references though)
+
+    # A single left-to-right scan: each match, including any "and <id>"
+    # clause, is consumed whole, so no text before its end is revisited.
+    for m in iter_ref_matches(text):
+        ref_type = m.lastgroup
+        id_group, second_group = REF_ID_GROUPS[ref_type]
+        start = m.start()
+        id_end = m.end(id_group)
+
+        # First ID: filtered and reported on its own span, e.g. "Tables A.3.5-1"
+        # Skip if this is part of a regulatory citation, or if context
+        # suggests an external document
+        excluded = (
+            (check_regulatory and is_regulatory_context(text, start, id_end))
+            or (check_external and is_external_reference(text, start, id_end, before_cache))
+        )
+        if not excluded:
+            # Normalize
+            if ref_type in ("section", "chapter"):
+                norm_id = normalize_section_id(m.group(id_group))
+            else:
+                norm_id = normalize_id(m.group(id_group))
+
+            refs.append(Reference(
+                ref_type=ref_type,
+                ref_id=sys.intern(norm_id),
+                raw_text=text[start:id_end],
+                volume=volume,
+                page=page_num,
+                context=get_context(text, start, id_end),
+            ))
 
-    for page_num, text in pages:
-        # Skip header/footer lines, TOC pages with dotted leaders
-        # (we still scan them for references though)
-
-        for ref_type, pattern, group_idx in REF_PATTERNS:
-            for m in pattern.finditer(text):
-                raw = m.group(0)
-                ref_id_raw = m.group(group_idx)
-
-                # Skip if this is part of a regulatory citation
-                if is_regulatory_context(text, m.start(), m.end()):
-                    continue
-
-                # Skip if context suggests external document
-                if is_external_reference(text, m.start(), m.end()):
-                    continue
-
-                # Normalize
-                if ref_type in ("section", "chapter"):
-                    norm_id = normalize_section_id(ref_id_raw)
-                else:
-                    norm_id = normalize_id(ref_id_raw)
-
-                context = get_context(text, m.start(), m.end())
-
-                refs.append(Reference(
-                    ref_type=ref_type,
-                    ref_id=norm_id,
-                    raw_text=raw,
-                    volume=volume,
-                    page=page_num,
-                    context=context,
-                ))
-
-        # Handle compound references (e.g., "Tables A.3.5-1 and A.3.5-2")
-        for m in COMPOUND_TABLE_RE.finditer(text):
-            if not is_external_reference(text, m.start(), m.end()):
-                # Second ID (first is already captured by the main pattern)
-                norm_id = normalize_id(m.group(2))
-                refs.append(Reference(
-                    ref_type="table",
-                    ref_id=norm_id,
-                    raw_text=m.group(0),
-                    volume=volume,
-                    page=page_num,
-                    context=get_context(text, m.start(), m.end()),
-                ))
-
-        for m in COMPOUND_FIGURE_RE.finditer(text):
-            if not is_external_reference(text, m.start(), m.end()):
-                norm_id = normalize_id(m.group(2))
-                refs.append(Reference(
-                    ref_type="figure",
-                    ref_id=norm_id,
-                    raw_text=m.group(0),
-                    volume=volume,
-                    page=page_num,
-                    context=get_context(text, m.start(), m.end()),
-                ))
-
-        for m in COMPOUND_SECTION_RE.finditer(text):
-            if not is_external_reference(text, m.start(), m.end()):
-                norm_id = normalize_section_id(m.group(2))
-                refs.append(Reference(
-                    ref_type="section",
-                    ref_id=norm_id,
-                    raw_text=m.group(0),
-                    volume=volume,
-                    page=page_num,
-                    context=get_context(text, m.start(), m.end()),
-                ))
-
-        for m in COMPOUND_APPENDIX_RE.finditer(text):
-            if not is_external_reference(text, m.start(), m.end()):
-                norm_id = normalize_id(m.group(2)).upper()
-                refs.append(Reference(
-                    ref_type="appendix",
-                    ref_id=norm_id,
-                    raw_text=m.group(0),
-                    volume=volume,
-                    page=page_num,
-                    context=get_context(text, m.start(), m.end()),
-                ))
+        # Second ID of a compound reference (e.g., "Tables A.3.5-1 and A.3.5-2")
+        second = m.group(second_group) if second_group else None
+        if second is not None and not (
+            check_external and is_external_reference(text, start, m.end(), before_cache)
+        ):
+            if ref_type == "section":
+                norm_id = normalize_section_id(second)
+            elif ref_type == "appendix":
+                norm_id = normalize_id(second).upper()
+            else:
+                norm_id = normalize_id(second)
+            second_refs.append(Reference(
+                ref_type=ref_type,
+                ref_id=sys.intern(norm_id),
+                raw_text=m.group(0),
+                volume=volume,
+                page=page_num,
+                context=get_context(text, start, m.end()),
+            ))
 
+    refs.extend(second_refs)
+    return refs
+
+
+def extract_references(pages: Iterable[tuple[int, str]], volume: str) -> list[Reference]:
+    """Extract all internal references from the document pages."""
+    refs = []
+    for page_num, text in pages:
+        refs.extend(page_references(page_num, text, volume))
     return refs
 
 
@@ -341,6 +560,12 @@ FIGURE_LABEL_RE = re.compile(
     re.MULTILINE | re.IGNORECASE
 )
 
+# Leading words of the case-insensitive labels, for the line dispatch in
+# page_targets. str.lower() is not enough there: IGNORECASE also matches
+# "FİGURE" (dotted capital I), whose lower() is not "figure".
+TABLE_WORD_RE = re.compile(r'Table', re.IGNORECASE)
+FIGURE_WORD_RE = re.compile(r'Figure', re.IGNORECASE)
+
 # Appendix header: "APPENDIX A" or "Appendix A" as a standalone heading
 APPENDIX_HEADER_RE = re.compile(
     r'^[ \t]*(?:APPENDIX|Appendix)\s+([A-Z])\b',
@@ -348,85 +573,122 @@ APPENDIX_HEADER_RE = re.compile(
 )
 
 
-def extract_targets(pages: list[tuple[int, str]], volume: str) -> list[Target]:
-    """Extract all reference targets (headings, labels) from document pages."""
-    targets = []
-
-    for page_num, text in pages:
-        # Section headings
-        for m in SECTION_HEADING_RE.finditer(text):
-            raw_id = m.group(1)
-            norm_id = normalize_section_id(raw_id)
-            targets.append(Target(
-                target_type="section",
-                target_id=norm_id,
-                raw_text=text[m.start():min(m.end() + 80, len(text))].split("\n")[0].strip(),
-                volume=volume,
-                page=page_num,
-            ))
-
-        # Chapter headings
-        for m in CHAPTER_HEADING_RE.finditer(text):
+def line_from(text: str, start: int, end: int, tail: int = 80) -> str:
+    """
+    Return the stripped line beginning at start, cut off at most tail
+    characters past end. Same result as slicing to end + tail and taking
+    the first line, without building the slice and split list.
+    """
+    stop = min(end + tail, len(text))
+    nl = text.find("\n", start, stop)
+    return text[start:nl if nl != -1 else stop].strip()
+
+
+def page_targets(page_num: int, text: str, volume: str) -> list[Target]:
+    """Extract all reference targets (headings, labels) from a single page."""
+    volume = sys.intern(volume)
+
+    # The target patterns are anchored at line starts, so walk the lines once
+    # and only try a pattern where the line's first word could begin it.
+    # A pattern may run onto later lines (e.g. a heading number with its
+    # title on the next line); last_end skips line starts a previous match
+    # already covered, exactly as finditer() would.
+    found: dict[str, list[Target]] = {
+        "section": [], "chapter": [], "table": [], "figure": [], "appendix": [],
+    }
+    last_end = dict.fromkeys(found, 0)
+
+    line_start = 0
+    for line in text.split("\n"):
+        start = line_start
+        line_start += len(line) + 1
+        lead = line.lstrip(" \t")
+        if not lead:
+            continue
+
+        if lead.startswith("S.") or lead[0].isdecimal():
+            target_type, pattern = "section", SECTION_HEADING_RE
+        elif lead.startswith(("CHAPTER", "Chapter")):
+            target_type, pattern = "chapter", CHAPTER_HEADING_RE
+        elif TABLE_WORD_RE.match(lead):
+            target_type, pattern = "table", TABLE_LABEL_RE
+        elif FIGURE_WORD_RE.match(lead):
+            target_type, pattern = "figure", FIGURE_LABEL_RE
+        elif lead.startswith(("APPENDIX", "Appendix")):
+            target_type, pattern = "appendix", APPENDIX_HEADER_RE
+        else:
+            continue
+
+        if start < last_end[target_type]:
+            continue
+        m = pattern.match(text, start)
+        if m is None:
+            continue
+        last_end[target_type] = m.end()
+
+        # Normalize; raw_text is the heading line, up to a short tail
+        if target_type == "section":
+            norm_id = normalize_section_id(m.group(1))
+            tail = 80
+        elif target_type == "chapter":
             norm_id = m.group(1).strip()
-            targets.append(Target(
-                target_type="chapter",
-                target_id=norm_id,
-                raw_text=text[m.start():min(m.end() + 60, len(text))].split("\n")[0].strip(),
-                volume=volume,
-                page=page_num,
-            ))
+            tail = 60
+        elif target_type == "appendix":
+            norm_id = m.group(1).upper()
+            tail = 60
+        else:
+            norm_id = normalize_id(m.group(1))
+            tail = 80
 
-        # Table labels
-        for m in TABLE_LABEL_RE.finditer(text):
-            raw_id = m.group(1)
-            norm_id = normalize_id(raw_id)
-            targets.append(Target(
-                target_type="table",
-                target_id=norm_id,
-                raw_text=text[m.start():min(m.end() + 80, len(text))].split("\n")[0].strip(),
-                volume=volume,
-                page=page_num,
-            ))
+        found[target_type].append(Target(
+            target_type=target_type,
+            target_id=sys.intern(norm_id),
+            raw_text=line_from(text, m.start(), m.end(), tail),
+            volume=volume,
+            page=page_num,
+        ))
 
-        # Figure labels
-        for m in FIGURE_LABEL_RE.finditer(text):
-            raw_id = m.group(1)
-            norm_id = normalize_id(raw_id)
-            targets.append(Target(
-                target_type="figure",
-                target_id=norm_id,
-                raw_text=text[m.start():min(m.end() + 80, len(text))].split("\n")[0].strip(),
-                volume=volume,
-                page=page_num,
-            ))
+    return [t for type_targets in found.values() for t in type_targets]
 
-        # Appendix headers
-        for m in APPENDIX_HEADER_RE.finditer(text):
-            norm_id = m.group(1).upper()
-            targets.append(Target(
-                target_type="appendix",
-                target_id=norm_id,
-                raw_text=text[m.start():min(m.end() + 60, len(text))].split("\n")[0].strip(),
-                volume=volume,
-                page=page_num,
-            ))
 
+def extract_targets(pages: Iterable[tuple[int, str]], volume: str) -> list[Target]:
+    """Extract all reference targets (headings, labels) from document pages."""
+    targets = []
+    for page_num, text in pages:
+        targets.extend(page_targets(page_num, text, volume))
     return targets
 
 
+def extract_refs_and_targets(
+    pages: Iterable[tuple[int, str]],
+    volume: str,
+) -> tuple[list[Reference], list[Target]]:
+    """
+    Extract references and targets in a single pass over the pages.
+    Each page's text is scanned once and can be discarded immediately, so
+    a streamed page iterator never needs to be held in memory.
+    """
+    refs = []
+    targets = []
+    for page_num, text in pages:
+        refs.extend(page_references(page_num, text, volume))
+        targets.extend(page_targets(page_num, text, volume))
+    return refs, targets
+
+
 # ---------------------------------------------------------------------------
 # Cross-reference matching
 # ---------------------------------------------------------------------------
 
-def build_target_index(all_targets: list[Target]) -> dict[str, set[str]]:
+def build_target_index(all_targets: list[Target]) -> dict[tuple[str, str], set[str]]:
     """
     Build a lookup: (type, normalized_id) -> set of target_ids found.
     Also indexes parent sections for prefix matching.
     """
-    index: dict[str, set[str]] = defaultdict(set)
+    index: dict[tuple[str, str], set[str]] = defaultdict(set)
 
     for t in all_targets:
-        key = f"{t.target_type}:{t.target_id}"
+        key = (t.target_type, t.target_id)
         index[key].add(t.target_id)
 
     return index
@@ -435,76 +697,83 @@ def build_target_index(all_targets: list[Target]) -> dict[str, set[str]]:
 def find_orphans(
     refs: list[Reference],
     targets: list[Target],
-) -> tuple[list[Reference], list[Reference]]:
+) -> tuple[list[Reference], list[Reference], dict[str, dict[str, set[str]]]]:
     """
-    Match references against targets. Returns (matched, orphaned).
+    Match references against targets. Returns (matched, orphaned, summary).
     Uses exact and prefix matching for sections.
+    summary holds the unique IDs per type under "refs", "targets",
+    "matched" and "orphaned", gathered in the same pass for the report.
     """
     # Build sets of known target IDs by type
     target_sets: dict[str, set[str]] = defaultdict(set)
     for t in targets:
         target_sets[t.target_type].add(t.target_id)
-        # For sections, also add without trailing sub-numbers for prefix matching
-        # e.g., if we have "3.2.4", also register "3.2" and "3"
-        if t.target_type == "section":
-            parts = t.target_id.split(".")
-            for i in range(1, len(parts)):
-                parent = ".".join(parts[:i])
-                target_sets["section"].add(parent)
+
+    # For sections, also collect every parent prefix for prefix matching
+    # e.g., if we have "3.2.4", also register "3.2" and "3"
+    section_prefixes = {
+        ".".join(parts[:i])
+        for parts in (tid.split(".") for tid in target_sets.get("section", ()))
+        for i in range(1, len(parts))
+    }
 
     matched = []
     orphaned = []
+    ref_by_type: dict[str, set[str]] = defaultdict(set)
+    matched_by_type: dict[str, set[str]] = defaultdict(set)
+    orphan_by_type: dict[str, set[str]] = defaultdict(set)
 
     # Deduplicate references for reporting (same type+id may appear many times)
-    seen_refs: dict[str, list[Reference]] = defaultdict(list)
+    seen_refs: dict[tuple[str, str], list[Reference]] = defaultdict(list)
     for r in refs:
-        key = f"{r.ref_type}:{r.ref_id}"
-        seen_refs[key].append(r)
+        seen_refs[(r.ref_type, r.ref_id)].append(r)
 
-    for key, ref_list in seen_refs.items():
-        ref_type, ref_id = key.split(":", 1)
+    for (ref_type, ref_id), ref_list in seen_refs.items():
+        ref_by_type[ref_type].add(ref_id)
         known = target_sets.get(ref_type, set())
 
         is_matched = ref_id in known
 
         # For sections, also try prefix match: "Section 5" matches if "5.1" exists
         if not is_matched and ref_type == "section":
-            for tid in known:
-                if tid.startswith(ref_id + ".") or tid == ref_id:
-                    is_matched = True
-                    break
+            is_matched = ref_id in section_prefixes
 
         if is_matched:
             matched.extend(ref_list)
+            matched_by_type[ref_type].add(ref_id)
         else:
             orphaned.extend(ref_list)
+            orphan_by_type[ref_type].add(ref_id)
 
-    return matched, orphaned
+    summary = {
+        "refs": ref_by_type,
+        "targets": target_sets,
+        "matched": matched_by_type,
+        "orphaned": orphan_by_type,
+    }
+    return matched, orphaned, summary
 
 
 # ---------------------------------------------------------------------------
 # Deduplication for reporting
 # ---------------------------------------------------------------------------
 
-def deduplicate_for_report(refs: list[Reference]) -> list[dict]:
-    """Group references by type+id and return summary entries."""
-    groups: dict[str, dict] = {}
-    for r in refs:
-        key = f"{r.ref_type}:{r.ref_id}"
-        if key not in groups:
-            groups[key] = {
-                "ref_type": r.ref_type,
-                "ref_id": r.ref_id,
-                "raw_text": r.raw_text,
-                "occurrences": [],
-            }
-        groups[key]["occurrences"].append({
-            "volume": r.volume,
-            "page": r.page,
-            "context": r.context,
-        })
-
-    return sorted(groups.values(), key=lambda x: (x["ref_type"], x["ref_id"]))
+def deduplicate_for_report(refs: list[Reference]) -> Iterator[dict]:
+    """Group references by type+id and yield summary entries, sorted by type+id."""
+    # sorted() is stable, so each group keeps its references in document
+    # order and raw_text comes from the first occurrence
+    key = attrgetter("ref_type", "ref_id")
+    for (ref_type, ref_id), group in groupby(sorted(refs, key=key), key=key):
+        group = list(group)
+        yield {
+            "ref_type": ref_type,
+            "ref_id": ref_id,
+            "raw_text": group[0].raw_text,
+            "occurrences": [
+                {"volume": r.volume, "page": r.page, "context": r.context}
+                for r in group
+            ],
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -512,13 +781,12 @@ def deduplicate_for_report(refs: list[Reference]) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 def generate_report(
-    matched: list[Reference],
     orphaned: list[Reference],
-    all_refs: list[Reference],
     all_targets: list[Target],
+    summary: dict[str, dict[str, set[str]]],
     output_path: str,
 ):
-    """Write a plain-text report."""
+    """Write a plain-text report. summary is the third result of find_orphans()."""
     lines = []
     w = lines.append
 
@@ -528,19 +796,10 @@ def generate_report(
     w("")
 
     # --- Summary statistics ---
-    ref_by_type: dict[str, set[str]] = defaultdict(set)
-    for r in all_refs:
-        ref_by_type[r.ref_type].add(r.ref_id)
-    target_by_type: dict[str, set[str]] = defaultdict(set)
-    for t in all_targets:
-        target_by_type[t.target_type].add(t.target_id)
-
-    orphan_by_type: dict[str, set[str]] = defaultdict(set)
-    for r in orphaned:
-        orphan_by_type[r.ref_type].add(r.ref_id)
-    matched_by_type: dict[str, set[str]] = defaultdict(set)
-    for r in matched:
-        matched_by_type[r.ref_type].add(r.ref_id)
+    ref_by_type = summary["refs"]
+    target_by_type = summary["targets"]
+    orphan_by_type = summary["orphaned"]
+    matched_by_type = summary["matched"]
 
     total_unique_refs = sum(len(v) for v in ref_by_type.values())
     total_unique_targets = sum(len(v) for v in target_by_type.values())
@@ -641,6 +900,45 @@ def generate_report(
 # Main
 # ---------------------------------------------------------------------------
 
+# Smallest page range worth handing to a worker on its own
+MIN_PAGES_PER_TASK = 32
+
+
+def process_pdf(
+    pdf_path: str,
+    start: int = 0,
+    stop: int | None = None,
+) -> tuple[list[Reference], list[Target]]:
+    """
+    Extract references and targets from a PDF, or from the 0-based page
+    range start:stop of it. Pages are streamed, so only one cache block of
+    text is held at a time.
+    """
+    if stop is None:
+        stop = count_pages(pdf_path)
+    return extract_refs_and_targets(iter_pages(pdf_path, start, stop), pdf_path)
+
+
+def plan_tasks(
+    page_counts: dict[str, int],
+    workers: int,
+) -> list[tuple[str, int, int]]:
+    """
+    Split the PDFs into (pdf_path, start, stop) page ranges so the work
+    spreads over all workers, not just one per volume. Ranges are at
+    least MIN_PAGES_PER_TASK pages, start on a CACHE_BLOCK_PAGES boundary,
+    and are listed in file and page order.
+    """
+    total_pages = sum(page_counts.values())
+    chunk = max(MIN_PAGES_PER_TASK, -(-total_pages // max(workers, 1)))
+    chunk = -(-chunk // CACHE_BLOCK_PAGES) * CACHE_BLOCK_PAGES
+    tasks = []
+    for pdf_path, n_pages in page_counts.items():
+        for start in range(0, n_pages, chunk):
+            tasks.append((pdf_path, start, min(start + chunk, n_pages)))
+    return tasks
+
+
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -655,28 +953,54 @@ def main():
         print("ERROR: No PDF files found in the script directory.")
         sys.exit(1)
 
+    page_counts = {pdf_path: count_pages(pdf_path) for pdf_path in pdf_files}
+
     print(f"Found {len(pdf_files)} PDF file(s):")
     for f in pdf_files:
-        print(f"  - {os.path.basename(f)}")
+        print(f"  - {os.path.basename(f)} ({page_counts[f]} pages)")
     print()
 
-    # Extract text from all PDFs
+    # Extract text from all PDFs -- pages are independent, so each volume is
+    # split into page ranges and the ranges run in worker processes
     all_refs: list[Reference] = []
     all_targets: list[Target] = []
 
-    for pdf_path in pdf_files:
-        basename = os.path.basename(pdf_path)
-        print(f"Processing: {basename} ...")
-
-        pages = extract_pages(pdf_path)
-        print(f"  Extracted {len(pages)} pages")
+    workers = os.cpu_count() or 1
+    tasks = plan_tasks(page_counts, workers)
+    remaining = defaultdict(int)
+    for pdf_path, _, _ in tasks:
+        remaining[pdf_path] += 1
+    per_pdf: dict[str, list[int]] = defaultdict(lambda: [0, 0])  # [refs, targets]
 
-        refs = extract_references(pages, pdf_path)
-        print(f"  Found {len(refs)} references")
-
-        targets = extract_targets(pages, pdf_path)
-        print(f"  Found {len(targets)} targets")
+    def print_processed(pdf_path: str) -> None:
+        print(f"Processed: {os.path.basename(pdf_path)}")
+        print(f"  Found {per_pdf[pdf_path][0]} references")
+        print(f"  Found {per_pdf[pdf_path][1]} targets")
 
+    # Volumes without pages get no tasks; report them up front
+    for pdf_path in pdf_files:
+        if pdf_path not in remaining:
+            print_processed(pdf_path)
+
+    results: dict[tuple[str, int, int], tuple[list[Reference], list[Target]]] = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=min(len(tasks), workers)) as executor:
+            futures = {executor.submit(process_pdf, *task): task for task in tasks}
+            for future in as_completed(futures):
+                task = futures[future]
+                refs, targets = future.result()
+                results[task] = (refs, targets)
+
+                pdf_path = task[0]
+                per_pdf[pdf_path][0] += len(refs)
+                per_pdf[pdf_path][1] += len(targets)
+                remaining[pdf_path] -= 1
+                if remaining[pdf_path] == 0:
+                    print_processed(pdf_path)
+
+    # Merge in file/page order so the report does not depend on worker timing
+    for task in tasks:
+        refs, targets = results[task]
         all_refs.extend(refs)
         all_targets.extend(targets)
 
@@ -687,16 +1011,15 @@ def main():
 
     # Cross-reference
     print("Cross-referencing ...")
-    matched, orphaned = find_orphans(all_refs, all_targets)
+    matched, orphaned, summary = find_orphans(all_refs, all_targets)
 
-    unique_orphan_ids = set(f"{r.ref_type}:{r.ref_id}" for r in orphaned)
-    print(f"  Matched:  {len(set(f'{r.ref_type}:{r.ref_id}' for r in matched))} unique ref IDs")
-    print(f"  Orphaned: {len(unique_orphan_ids)} unique ref IDs")
+    print(f"  Matched:  {sum(len(v) for v in summary['matched'].values())} unique ref IDs")
+    print(f"  Orphaned: {sum(len(v) for v in summary['orphaned'].values())} unique ref IDs")
     print()
 
     # Generate report
     report_path = os.path.join(script_dir, "sweis_ref_report.txt")
-    generate_report(matched, orphaned, all_refs, all_targets, report_path)
+    generate_report(orphaned, all_targets, summary, report_path)
 
     print()
     print("Done.")